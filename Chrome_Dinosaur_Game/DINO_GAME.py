@@ -1,13 +1,37 @@
+import argparse
 import cv2
 import numpy as np
 import joblib
 import pygame
+import sys
 from sys import exit
 from random import randrange, choice
 import os
 
-jump_model = joblib.load('jump_model.pkl')
-msg = ''
+# The input backends live next to simple_dino.py, one folder up
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from animation import AnimatedSprite, AnimationClock, AnimationSet, bake
+from input_backends import BACKENDS, create_backend, prepare_canny_frame
+
+parser = argparse.ArgumentParser(description="Chrome Dinosaur Game")
+parser.add_argument('--input', choices=sorted(BACKENDS), default='canny', help="How jumps are detected")
+parser.add_argument('--replay', help="Jump file for the replay input")
+parser.add_argument('--online', action='store_true', help="Keep training the canny model from pose-labeled frames")
+parser.add_argument('--online-model', default='jump_model_online.pkl', help="Where --online saves the updated model")
+args = parser.parse_args()
+if args.input == 'replay' and not args.replay:
+    parser.error("--input replay needs --replay FILE")
+if args.online and args.input != 'canny':
+    parser.error("--online only works with --input canny")
+
+# Only the canny input needs the SVM file
+jump_model = joblib.load('jump_model.pkl') if args.input == 'canny' else None
+
+# Online learning: a background worker keeps updating a copy of the model and swaps it in
+online_trainer = None
+if args.online:
+    from online_learning import OnlineJumpTrainer
+    online_trainer = OnlineJumpTrainer(jump_model).start()
 
 def convert_frame_to_model(Canny_image):
     '''
@@ -15,19 +39,28 @@ def convert_frame_to_model(Canny_image):
     2° step = reshape the image to (-1, img.size)
     3° step = give the image to the model
     '''
-    #1° Step
-    width = 128
-    height = 96
-    dim = (width, height)
-    resized = cv2.resize(Canny_image, dim, interpolation = cv2.INTER_AREA)
-    
-    #2° Step
-    reshaped_image = resized.reshape(-1, resized.size)
+    #1° and 2° Step
+    reshaped_image = prepare_canny_frame(Canny_image)
     
     #3° Step
-    return jump_model.predict(reshaped_image)
-    
-cap = cv2.VideoCapture(0)
+    model = online_trainer.model if online_trainer else jump_model
+    return model.predict(reshaped_image)
+
+if args.input == 'canny':
+    input_backend = create_backend('canny', convert_frame_to_model,
+                                   on_frame=online_trainer.harvest if online_trainer else None)
+elif args.input == 'replay':
+    input_backend = create_backend('replay', args.replay)
+else:
+    input_backend = create_backend(args.input)
+
+def release_everything():
+    input_backend.stop()
+    print(input_backend.latency_stats())
+    if online_trainer:
+        online_trainer.stop()
+        online_trainer.save(args.online_model)
+        print(f'Online model saved to {args.online_model} after {online_trainer.updates} updates')
 
 
 x = 800 #500
@@ -61,9 +94,16 @@ font = pygame.font.SysFont('comicsansms', 40, True, True)
 score_sound = pygame.mixer.Sound(os.path.join(THIS_FOLDER,'score_sound.wav'))
 score_sound.set_volume(0.2)
 
-class Dino(pygame.sprite.Sprite):
+# Sprite animations are baked once and advance with elapsed time (FPS / 4 frames per second)
+animation_clock = AnimationClock()
+DINO_ANIMATIONS = AnimationSet().add(
+    'run', bake([os.path.join(THIS_FOLDER, f'dinossaur{i}.png') for i in range(3)], (128, 128)), FPS / 4)
+FLYING_DINO_ANIMATIONS = AnimationSet().add(
+    'fly', bake([os.path.join(THIS_FOLDER, f'fly_dino{i}.png') for i in range(2)], (128, 128)), FPS / 4)
+
+class Dino(AnimatedSprite):
     def __init__(self):
-        super().__init__()
+        super().__init__(DINO_ANIMATIONS, animation_clock, 'run')
         self.jump_sound = pygame.mixer.Sound(os.path.join(THIS_FOLDER,'jump_sound.wav'))
         self.death_sound = pygame.mixer.Sound(os.path.join(THIS_FOLDER, 'death_sound.wav'))
         
@@ -71,13 +111,6 @@ class Dino(pygame.sprite.Sprite):
         self.stop = False
         self.xpos = 50
         self.ypos = (SCREEN_HEIGHT // 2) + 140
-        self.dino_imgs = [os.path.join(THIS_FOLDER,f'dinossaur{i}.png') for i in range(3)]
-
-        self.index = 0
-        self.image = pygame.image.load(self.dino_imgs[self.index]).convert_alpha()
-        self.mask = pygame.mask.from_surface(self.image)
-
-        self.image = pygame.transform.scale(self.image, (84, 84))
         self.rect = self.image.get_rect()
         self.rect[0], self.rect[1] = self.xpos, self.ypos
     
@@ -108,40 +141,22 @@ class Dino(pygame.sprite.Sprite):
                     self.rect[1] -= 30
         
             #SPRITES
-            if self.index >= len(self.dino_imgs) - 1:
-                self.index = 0
-            self.index += 0.25
-
-            self.image = pygame.image.load(self.dino_imgs[int(self.index)]).convert_alpha()
-            self.image = pygame.transform.scale(self.image, (128, 128))
-            self.mask = pygame.mask.from_surface(self.image)
+            self.animate()
 
         else:
             pass
 
-class Flying_dino(pygame.sprite.Sprite):
+class Flying_dino(AnimatedSprite):
     def __init__(self):
-        super().__init__()        
-        self.flying_dino_imgs = [os.path.join(THIS_FOLDER, f'fly_dino{i}.png') for i in range(2)]
+        super().__init__(FLYING_DINO_ANIMATIONS, animation_clock, 'fly')
         self.stop = False
-        self.index = 0
-        self.image = pygame.image.load(self.flying_dino_imgs[self.index]).convert_alpha()
-        self.mask = pygame.mask.from_surface(self.image)
-        
-        self.image = pygame.transform.scale(self.image, (84, 84))
         self.rect = self.image.get_rect()
         self.rect[0], self.rect[1] = SCREEN_WIDTH, (SCREEN_HEIGHT // 2) 
 
     def update(self):
         #SPRITES
         if self.stop == False:
-            if self.index >= len(self.flying_dino_imgs) - 1:
-                self.index = 0
-
-            self.index += 0.25
-            self.image = pygame.image.load(self.flying_dino_imgs[int(self.index)]).convert_alpha()
-            self.image = pygame.transform.scale(self.image, (128, 128))
-            self.mask = pygame.mask.from_surface(self.image)
+            self.animate()
         else:
             pass
 
@@ -215,46 +230,28 @@ clock = pygame.time.Clock()
 
 obstacle_choice = choice([obstacle, flying_dino])
 
+input_backend.start()
+
 while True:
-    sucess, img = cap.read()
-    
-    gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
-    imgCanny = cv2.Canny(gray, 155, 105)
-        
-    model_prediction = convert_frame_to_model(imgCanny)
-        
-    if model_prediction == 0:
-        msg = 'Not jumping'
-    else:
-        msg = 'Jumping'
-            
-    cv2.putText(imgCanny, f'{msg}', (480//2, 50), cv2.FONT_HERSHEY_SIMPLEX,1,(255,255,255),3) #msg, origin, font, scale_font, color, thickness
-    cv2.imshow('Canny', imgCanny)
-                
-    if cv2.waitKey(1) & 0xff == ord('q'):
+    if input_backend.show_preview('Canny') == ord('q'):
         break
     
-    clock.tick(FPS)
+    animation_clock.tick(clock.tick(FPS))
     screen.fill(WHITE)
 
     for event in pygame.event.get():
         if event.type == pygame.QUIT:
+            release_everything()
             pygame.quit()
             exit()
 
+        input_backend.handle_event(event)
+
         if event.type == pygame.KEYDOWN:
             if event.key == pygame.K_q:
-                cap.release()
-                cv2.destroyAllWindows()
+                release_everything()
                 pygame.quit()
                 exit()
-                '''
-                if event.key == pygame.K_SPACE:
-                    if dino.rect[1] < dino.ypos:
-                        pass
-                    else:
-                        dino.jump()
-                '''
             if event.key == pygame.K_r and GAME_OVER == True:
                 GAME_SPEED = 10
                 FLOOR_SPEED = 10
@@ -285,7 +282,7 @@ while True:
     text = font.render(f'{points}', True, BLACK)
     screen.blit(text, (700, 40))
     
-    if model_prediction == 1:
+    if input_backend.poll_jump():
         if dino.rect[1] < dino.ypos:
             pass
         else:
@@ -326,5 +323,4 @@ while True:
     pygame.display.flip()
 
 #Release everything if job is finished
-cap.release()
-cv2.destroyAllWindows()
\ No newline at end of file
+release_everything()
\ No newline at end of file
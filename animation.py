@@ -0,0 +1,85 @@
+import pygame
+
+
+def bake(paths, size):
+    # Load, scale and alpha-convert a frame sequence once (needs the display to be set up)
+    return [pygame.transform.scale(pygame.image.load(path), size).convert_alpha() for path in paths]
+
+
+class Animation:
+    """One state of an AnimationSet: a run of frames plus its timing."""
+    __slots__ = ('start', 'count', 'frame_ms', 'loop')
+
+    def __init__(self, start, count, fps, loop):
+        self.start = start
+        self.count = count
+        self.frame_ms = 1000 / fps
+        self.loop = loop
+
+    def frame_at(self, elapsed_ms):
+        # Index into the set's frame arrays for this much time in the state
+        step = int(elapsed_ms // self.frame_ms)
+        if self.loop:
+            step %= self.count
+        elif step >= self.count:
+            step = self.count - 1  # One-shot animations hold their last frame
+        return self.start + step
+
+
+class AnimationSet:
+    """All states of a sprite, pre-baked into flat frame and mask arrays.
+
+    Each frame has a single index shared by `frames` and `masks`, so other
+    per-frame data (e.g. CollisionTable rows) can use the same index.
+    """
+
+    def __init__(self):
+        self.frames = ()
+        self.masks = ()
+        self.states = {}
+
+    def add(self, state, images, fps, loop=True):
+        start = len(self.frames)
+        self.frames += tuple(images)
+        self.masks += tuple(pygame.mask.from_surface(image) for image in images)
+        self.states[state] = Animation(start, len(images), fps, loop)
+        return self
+
+
+class AnimationClock:
+    """Game time in milliseconds; one instance drives every animated sprite."""
+
+    def __init__(self):
+        self.now = 0
+
+    def tick(self, elapsed_ms):
+        self.now += elapsed_ms
+
+
+class AnimatedSprite(pygame.sprite.Sprite):
+    """Sprite whose image and mask are picked from an AnimationSet by elapsed time.
+
+    Switching state or frame only swaps references into the pre-baked arrays.
+    """
+
+    def __init__(self, animations, clock, state):
+        super().__init__()
+        self.animations = animations
+        self.clock = clock
+        self.state = None
+        self.index = None
+        self.play(state)
+        self.animate()
+
+    def play(self, state, restart=False):
+        if state != self.state or restart:
+            self.state = state
+            self.animation = self.animations.states[state]
+            self.started = self.clock.now
+
+    def animate(self):
+        index = self.animation.frame_at(self.clock.now - self.started)
+        if index != self.index:
+            self.index = index
+            self.image = self.animations.frames[index]
+            self.mask = self.animations.masks[index]
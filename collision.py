@@ -0,0 +1,35 @@
+import pygame
+
+
+class CollisionTable:
+    """Precomputed mask collisions for every (dino frame, obstacle image) pair.
+
+    The dino never leaves x=50 and obstacles always sit on the floor, so a hit
+    depends only on the two images and their (dx, dy) offset. For each pair,
+    `Mask.convolve` marks every offset at which the masks overlap; that bitmap
+    is flattened to bytes once at load time. A collision test is then one
+    bounds check and one byte lookup. It needs no pygame objects, so batch
+    simulators can share the table. The answers are the same as
+    `dino_mask.overlap(obstacle_mask, (dx, dy)) is not None`.
+    """
+
+    def __init__(self, dino_masks, obstacle_masks):
+        self.tables = [[self._build(dino_mask, obstacle_mask) for obstacle_mask in obstacle_masks]
+                       for dino_mask in dino_masks]
+
+    @staticmethod
+    def _build(dino_mask, obstacle_mask):
+        # convolve sets bit (i, j) when the obstacle's bottom right corner at (i, j) overlaps the dino
+        hits = dino_mask.convolve(obstacle_mask)
+        width, height = hits.get_size()
+        # Render set bits as red=1 and keep one byte per pixel: row-major 0/1 bytes
+        surface = hits.to_surface(setcolor=(1, 0, 0, 255), unsetcolor=(0, 0, 0, 255))
+        bits = pygame.image.tobytes(surface, 'RGBA')[::4]
+        shift_x, shift_y = obstacle_mask.get_size()[0] - 1, obstacle_mask.get_size()[1] - 1
+        return bits, width, height, shift_x, shift_y
+
+    def collides(self, dino_index, obstacle_index, dx, dy):
+        # dx, dy: obstacle position relative to the dino's top left corner
+        bits, width, height, shift_x, shift_y = self.tables[dino_index][obstacle_index]
+        x, y = dx + shift_x, dy + shift_y
+        return 0 <= x < width and 0 <= y < height and bits[y * width + x] == 1
@@ -0,0 +1,263 @@
+import json
+import queue
+import statistics
+import threading
+import time
+from collections import deque, namedtuple
+
+import cv2
+import pygame
+
+# A single jump request. `timestamp` is time.perf_counter() at the moment the
+# input was captured (camera frame read, key pressed, replay time reached), so
+# the game can measure end-to-end latency when it finally consumes the event.
+# pygame key events carry no capture time, so keyboard events are stamped when
+# the game loop drains the event queue: their latency excludes the up to one
+# frame a key press waits in that queue.
+JumpEvent = namedtuple('JumpEvent', ['source', 'timestamp'])
+
+
+class InputBackend:
+    """Base class for everything that can make the dino jump.
+
+    Threaded backends do their capture work in `step()` on a background thread
+    and hand jumps to the game through a small bounded queue, so the game loop
+    never waits on a camera or a model. The game only calls `poll_jump()` once
+    per frame.
+    """
+    name = 'base'
+    threaded = True
+
+    def __init__(self, max_events=8):
+        self.events = queue.Queue(maxsize=max_events)
+        self.latencies = deque(maxlen=1000)  # Seconds from capture to consumption
+        self.preview = None  # Latest annotated camera frame, if the backend has one
+        self._running = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self.threaded and self._thread is None:
+            self._running.set()
+            self._thread = threading.Thread(target=self._run, name=f'{self.name}-input', daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._running.clear()
+        if self._thread is not None:
+            # The worker releases its own resources once its current step returns,
+            # so a slow camera read is never closed underneath it
+            self._thread.join(timeout=1.0)
+            self._thread = None
+        else:
+            self.release()
+        if self.preview is not None:
+            cv2.destroyAllWindows()
+
+    def _run(self):
+        try:
+            while self._running.is_set():
+                self.step()
+        finally:
+            self.release()
+
+    def step(self):
+        # One unit of background work (e.g. read and classify one frame)
+        raise NotImplementedError
+
+    def release(self):
+        # Close cameras etc.; runs on the worker thread for threaded backends
+        pass
+
+    def handle_event(self, event):
+        # Called with every pygame event from the main thread
+        pass
+
+    def push(self, timestamp=None):
+        if timestamp is None:
+            timestamp = time.perf_counter()
+        event = JumpEvent(self.name, timestamp)
+        try:
+            self.events.put_nowait(event)
+        except queue.Full:
+            # Drop the stalest jump rather than block the producer
+            try:
+                self.events.get_nowait()
+            except queue.Empty:
+                pass
+            self.events.put_nowait(event)
+
+    def poll_jump(self):
+        # Drain everything queued since the last frame; any event means "jump now"
+        now = time.perf_counter()
+        jumped = False
+        while True:
+            try:
+                event = self.events.get_nowait()
+            except queue.Empty:
+                return jumped
+            self.latencies.append(now - event.timestamp)
+            jumped = True
+
+    def show_preview(self, window_name):
+        # OpenCV windows must be driven from the main thread; returns the key pressed, if any
+        frame = self.preview
+        if frame is None:
+            return None
+        cv2.imshow(window_name, frame)
+        return cv2.waitKey(1) & 0xFF
+
+    def latency_stats(self):
+        # End-to-end input latency in milliseconds. Keyboard numbers start when the
+        # game loop reads the key event, so they exclude pygame event-queue delay
+        if not self.latencies:
+            return {'backend': self.name, 'count': 0}
+        samples = sorted(seconds * 1000 for seconds in self.latencies)
+        return {
+            'backend': self.name,
+            'count': len(samples),
+            'mean_ms': statistics.fmean(samples),
+            'p50_ms': samples[len(samples) // 2],
+            'p95_ms': samples[min(len(samples) - 1, int(len(samples) * 0.95))],
+            'max_ms': samples[-1],
+        }
+
+
+class KeyboardBackend(InputBackend):
+    name = 'keyboard'
+    threaded = False  # pygame events only arrive on the main thread
+
+    def __init__(self, keys=(pygame.K_SPACE, pygame.K_UP), max_events=8):
+        super().__init__(max_events)
+        self.keys = keys
+
+    def handle_event(self, event):
+        if event.type == pygame.KEYDOWN and event.key in self.keys:
+            self.push()
+
+
+class PoseBackend(InputBackend):
+    name = 'pose'
+
+    def __init__(self, max_events=8):
+        super().__init__(max_events)
+        # Imported here so keyboard/replay play does not pull in MediaPipe
+        from jump_detection import JumpDetector
+        self.detector = JumpDetector(show_preview=False)
+
+    def step(self):
+        success, image = self.detector.cap.read()
+        timestamp = time.perf_counter()
+        if not success:
+            time.sleep(0.01)
+            return
+        if self.detector.detect(image):
+            self.push(timestamp)
+        self.preview = self.detector.last_image
+
+    def release(self):
+        self.detector.cap.release()
+
+
+# Size the Canny SVM was trained on (width, height)
+CANNY_MODEL_SIZE = (128, 96)
+
+
+def prepare_canny_frame(Canny_image):
+    # Resize to the training size and flatten to a single sample row
+    resized = cv2.resize(Canny_image, CANNY_MODEL_SIZE, interpolation = cv2.INTER_AREA)
+    return resized.reshape(-1, resized.size)
+
+
+def load_canny_classifier(path):
+    import joblib
+    model = joblib.load(path)
+    return lambda Canny_image: model.predict(prepare_canny_frame(Canny_image))
+
+
+class CannyBackend(InputBackend):
+    """Canny edge image fed to a jump classifier (the Chrome_Dinosaur_Game SVM).
+
+    `classify` takes the Canny image and returns the model prediction, 1 for
+    jumping. A jump is reported on the frame the prediction switches to 1.
+    `on_frame`, if given, is called with every camera frame and its Canny image
+    on the capture thread (used to harvest training samples); it must be quick.
+    """
+    name = 'canny'
+
+    def __init__(self, classify, camera_index=0, max_events=8, on_frame=None):
+        super().__init__(max_events)
+        self.classify = classify
+        self.on_frame = on_frame
+        self.cap = cv2.VideoCapture(camera_index)
+        if not self.cap.isOpened():
+            raise ValueError("Could not open camera")
+        self.was_jumping = False
+
+    def step(self):
+        success, img = self.cap.read()
+        timestamp = time.perf_counter()
+        if not success:
+            time.sleep(0.01)
+            return
+
+        gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+        imgCanny = cv2.Canny(gray, 155, 105)
+        jumping = bool(self.classify(imgCanny) == 1)
+
+        if jumping and not self.was_jumping:
+            self.push(timestamp)
+        self.was_jumping = jumping
+        # After the push, so harvesting never delays the jump event
+        if self.on_frame is not None:
+            self.on_frame(img, imgCanny)
+
+        msg = 'Jumping' if jumping else 'Not jumping'
+        cv2.putText(imgCanny, msg, (480//2, 50), cv2.FONT_HERSHEY_SIMPLEX, 1, (255, 255, 255), 3)
+        self.preview = imgCanny
+
+    def release(self):
+        self.cap.release()
+
+
+class ReplayBackend(InputBackend):
+    """Plays back jumps from a JSON file: {"jumps": [seconds since start, ...]}."""
+    name = 'replay'
+
+    def __init__(self, path, max_events=8):
+        super().__init__(max_events)
+        with open(path) as f:
+            self.jump_times = sorted(json.load(f)['jumps'])
+        self.next_jump = 0
+        self.start_time = None
+
+    def start(self):
+        self.start_time = time.perf_counter()
+        return super().start()
+
+    def step(self):
+        if self.next_jump >= len(self.jump_times):
+            self._running.clear()
+            return
+        due = self.start_time + self.jump_times[self.next_jump]
+        delay = due - time.perf_counter()
+        if delay > 0:
+            time.sleep(min(delay, 0.05))  # Wake up regularly so stop() stays responsive
+            return
+        # Stamp with the scheduled time so latency includes any pickup delay
+        self.push(due)
+        self.next_jump += 1
+
+
+BACKENDS = {
+    'keyboard': KeyboardBackend,
+    'pose': PoseBackend,
+    'canny': CannyBackend,
+    'replay': ReplayBackend,
+}
+
+
+def create_backend(name, *args, **kwargs):
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown input backend '{name}', choose from {', '.join(BACKENDS)}")
+    return BACKENDS[name](*args, **kwargs)
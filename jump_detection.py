@@ -4,7 +4,7 @@ import mediapipe as mp
 from collections import deque
 
 class JumpDetector:
-    def __init__(self):
+    def __init__(self, show_preview=True, open_camera=True):
         # Initialize MediaPipe Pose
         self.mp_pose = mp.solutions.pose
         self.mp_draw = mp.solutions.drawing_utils
@@ -14,12 +14,15 @@ class JumpDetector:
         )
         
         # Initialize camera with lower resolution
-        self.cap = cv2.VideoCapture(0)
-        if not self.cap.isOpened():
-            raise ValueError("Could not open camera")
-        # Set lower resolution for better performance
-        self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, 320)
-        self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 240)
+        # (skipped when frames come from someone else's camera through detect())
+        self.cap = None
+        if open_camera:
+            self.cap = cv2.VideoCapture(0)
+            if not self.cap.isOpened():
+                raise ValueError("Could not open camera")
+            # Set lower resolution for better performance
+            self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, 320)
+            self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 240)
         
         # Previous y positions of hips to detect movement (using a larger buffer for better smoothing)
         self.hip_positions = deque(maxlen=10)  # Increased buffer size
@@ -27,13 +30,19 @@ class JumpDetector:
         self.min_positions = 8  # Minimum positions needed for reliable detection
         self.is_jumping_state = False
         self.jump_cooldown = 15  # Increased cooldown to prevent rapid jumps
+        # Only the main thread may open OpenCV windows, so background readers turn this off
+        self.show_preview = show_preview
+        self.last_image = None  # Last annotated frame, for callers that draw it themselves
+        self.last_movement = None  # Hip movement on the last frame, None if it couldn't be measured
         
     def is_jumping(self):
         success, image = self.cap.read()
         if not success:
             print("Failed to grab frame")
             return False
-        
+        return self.detect(image)
+
+    def detect(self, image):
         # Convert the BGR image to RGB
         image_rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
         
@@ -44,6 +53,7 @@ class JumpDetector:
         image = cv2.cvtColor(image_rgb, cv2.COLOR_RGB2BGR)
         
         jump_detected = False
+        self.last_movement = None
         
         if results.pose_landmarks:
             # Draw the pose landmarks on the image
@@ -74,6 +84,7 @@ class JumpDetector:
                 current_pos = sum(p * (i+1) for i, p in enumerate(current_positions)) / sum(range(1, len(current_positions) + 1))
                 
                 movement = past_pos - current_pos
+                self.last_movement = movement
                 
                 # Draw movement value on screen with color coding
                 color = (0, 255, 0) if movement > self.jump_threshold else (
@@ -116,12 +127,15 @@ class JumpDetector:
         )
         
         # Show the image
-        cv2.imshow('Jump Detection', image)
+        self.last_image = image
+        if self.show_preview:
+            cv2.imshow('Jump Detection', image)
         
         return jump_detected
     
     def release(self):
-        self.cap.release()
+        if self.cap is not None:
+            self.cap.release()
         cv2.destroyAllWindows()
 
 # Test the jump detection
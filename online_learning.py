@@ -0,0 +1,161 @@
+import copy
+import queue
+import random
+import threading
+import time
+from collections import deque
+
+import joblib
+import numpy as np
+from sklearn.linear_model import SGDClassifier
+
+from input_backends import prepare_canny_frame
+
+
+class ReplayBuffer:
+    """Bounded store of (features, label) samples shared by the capture and training threads."""
+
+    def __init__(self, maxlen=2000):
+        self.samples = deque(maxlen=maxlen)
+        self.lock = threading.Lock()
+        self.added = 0  # Total samples ever added, to tell when there is new data
+
+    def add(self, features, label):
+        with self.lock:
+            self.samples.append((features, label))
+            self.added += 1
+
+    def labels(self):
+        with self.lock:
+            return {label for _, label in self.samples}
+
+    def batch(self, size, fresh):
+        # The `fresh` newest samples plus random older ones, so old rooms/players aren't forgotten
+        with self.lock:
+            samples = list(self.samples)
+        fresh = min(fresh, size, len(samples))
+        newest = samples[len(samples) - fresh:]
+        older = samples[:len(samples) - fresh]
+        chosen = newest + random.sample(older, min(size - fresh, len(older)))
+        X = np.vstack([features for features, _ in chosen])
+        y = np.array([label for _, label in chosen])
+        return X, y
+
+
+class PoseLabeler:
+    """Labels camera frames with MediaPipe hip motion, the trusted signal for the Canny model."""
+
+    def __init__(self):
+        # Imported here so the rest of this module works without MediaPipe
+        from jump_detection import JumpDetector
+        self.detector = JumpDetector(show_preview=False, open_camera=False)
+
+    def label(self, image):
+        # 1 while the hips are up, 0 while standing, None if the pose couldn't be measured
+        self.detector.detect(image)
+        if self.detector.last_movement is None:
+            return None
+        return int(self.detector.is_jumping_state)
+
+
+class OnlineJumpTrainer:
+    """Keeps the Canny jump classifier learning from live play.
+
+    The capture thread calls `harvest()` with each camera frame, which only
+    queues a copy. A labeling thread runs the labeler on every queued frame
+    (its pose window and cooldown are tuned per camera frame) and adds every
+    Nth labeled frame to a bounded replay buffer. A training thread updates a
+    copy of a linear SGD model (hinge loss, i.e. a linear SVM) with mini-batches
+    and then swaps it into `self.model`, so the game never waits on labeling or
+    training. The first update starts from the offline SVC's weights.
+    """
+
+    def __init__(self, initial_model, labeler=None, buffer_size=2000, batch_size=64,
+                 fresh_per_batch=32, sample_every=3, frame_queue_size=8, eta0=1e-6):
+        self.model = initial_model
+        self.labeler = labeler if labeler is not None else PoseLabeler()
+        self.frames = queue.Queue(maxsize=frame_queue_size)
+        self.buffer = ReplayBuffer(buffer_size)
+        self.batch_size = batch_size
+        self.fresh_per_batch = fresh_per_batch
+        self.sample_every = sample_every  # Neighbouring frames are near duplicates, keep every Nth
+        self.eta0 = eta0
+        self.frames_labeled = 0
+        self.frames_dropped = 0
+        self.updates = 0
+        self._trained_upto = 0
+        self._running = threading.Event()
+        self._threads = []
+
+    def harvest(self, image, Canny_image):
+        # Called on the capture thread: never block it, drop the frame if the labeler is behind
+        try:
+            self.frames.put_nowait((image, Canny_image.copy()))
+        except queue.Full:
+            self.frames_dropped += 1
+
+    def start(self):
+        if not self._threads:
+            self._running.set()
+            self._threads = [
+                threading.Thread(target=self._label_frames, name='online-labeler', daemon=True),
+                threading.Thread(target=self._train, name='online-trainer', daemon=True),
+            ]
+            for thread in self._threads:
+                thread.start()
+        return self
+
+    def stop(self):
+        self._running.clear()
+        for thread in self._threads:
+            thread.join(timeout=5.0)
+        self._threads = []
+
+    def _label_frames(self):
+        while self._running.is_set():
+            try:
+                image, Canny_image = self.frames.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            label = self.labeler.label(image)
+            if label is None:
+                continue
+            self.frames_labeled += 1
+            if self.frames_labeled % self.sample_every == 0:
+                self.buffer.add(prepare_canny_frame(Canny_image), label)
+
+    def _train(self):
+        while self._running.is_set():
+            if not self.update():
+                time.sleep(0.1)
+
+    def update(self):
+        # One mini-batch step; returns False when there wasn't enough new data
+        if self.buffer.added - self._trained_upto < self.fresh_per_batch:
+            return False
+        if not isinstance(self.model, SGDClassifier) and len(self.buffer.labels()) < 2:
+            return False  # The warm start needs both jumping and standing samples
+        added = self.buffer.added
+        X, y = self.buffer.batch(self.batch_size, self.fresh_per_batch)
+
+        if isinstance(self.model, SGDClassifier):
+            model = copy.deepcopy(self.model)  # Train a copy; the game keeps using the old one
+            model.partial_fit(X, y)
+        else:
+            if len(set(y)) < 2:
+                return False
+            # One pass over the first batch, starting from the offline linear SVC
+            coef = self.model.coef_
+            if hasattr(coef, 'toarray'):
+                coef = coef.toarray()
+            model = SGDClassifier(loss='hinge', learning_rate='constant', eta0=self.eta0,
+                                  max_iter=1, tol=None)
+            model.fit(X, y, coef_init=coef, intercept_init=self.model.intercept_)
+
+        self.model = model  # Hot swap: attribute assignment is atomic
+        self._trained_upto = added
+        self.updates += 1
+        return True
+
+    def save(self, path):
+        joblib.dump(self.model, path)
@@ -0,0 +1,244 @@
+import argparse
+import json
+import math
+import os
+import random
+import statistics
+import time
+
+# No window and no sound card needed: render into SDL's dummy drivers
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import pygame
+
+from animation import bake
+
+# Same assets and sizes as simple_dino.py
+SPRITE_ASSETS = {
+    'floor': [(os.path.join('art', 'floor.png'), (94, 94))],
+    'clouds': [(os.path.join('art', 'clouds.png'), (128, 71))],
+    'flying_dinos': [(os.path.join('art', f'fly_dino{i}.png'), (80, 80)) for i in range(2)],
+    'obstacles': [(os.path.join('art', 'obstacles', f'obstacle{i}.png'), (60, 80)) for i in range(2)],
+    'dino': [(os.path.join('art', f'dino_run({i}).png'), (90, 90)) for i in range(1, 8)],
+}
+BAKED = {'dino', 'flying_dinos'}  # Animated sprites the game pre-bakes with animation.bake
+SKY_PATH = os.path.join('art', 'sky.png')
+PHASES = ('sky', 'sprites', 'text', 'flip')
+
+DEFAULT_RESOLUTION = (1280, 600)
+SWEEP_RESOLUTIONS = [(640, 300), (1280, 600), (1920, 900), (2560, 1200)]
+SWEEP_COUNTS = {
+    'floor': [11, 22, 44, 88],
+    'clouds': [1, 8, 32, 128],
+    'flying_dinos': [1, 8, 32, 128],
+    'obstacles': [1, 8, 32, 128],
+}
+NOISE_MADS = 4  # How many median absolute deviations of repeat noise a slowdown must exceed
+
+
+def load_and_scale(path, size):
+    image = pygame.image.load(path)
+    return pygame.transform.scale(image, size)
+
+
+def default_scene(width):
+    # What simple_dino.py builds at this width
+    return {'floor': len(range(0, width + 128, 64)), 'clouds': 1, 'flying_dinos': 1, 'obstacles': 1}
+
+
+def build_scenes(resolutions, counts):
+    # One-at-a-time sweep around simple_dino's own scene, which is timed once as 'default'
+    base = default_scene(DEFAULT_RESOLUTION[0])
+    scenes = [('default', DEFAULT_RESOLUTION, base)]
+    for width, height in resolutions:
+        if (width, height) != DEFAULT_RESOLUTION:
+            scenes.append((f'{width}x{height}', (width, height), default_scene(width)))
+    for kind, values in counts.items():
+        for count in values:
+            if count != base[kind]:
+                scenes.append((f'{kind}={count}', DEFAULT_RESOLUTION, dict(base, **{kind: count})))
+    return scenes
+
+
+def build_sprites(scene, size, rng):
+    width, height = size
+    all_sprites = pygame.sprite.Group()
+    images = {kind: bake([path for path, _ in assets], assets[0][1]) if kind in BAKED
+              else [load_and_scale(path, scale) for path, scale in assets]
+              for kind, assets in SPRITE_ASSETS.items()}
+
+    def add(image, x, y):
+        sprite = pygame.sprite.Sprite()
+        sprite.image = image
+        sprite.rect = image.get_rect(topleft=(x, y))
+        all_sprites.add(sprite)
+
+    # Draw order matches simple_dino.py: clouds, flying dinos, floor, dino, obstacles
+    for _ in range(scene['clouds']):
+        add(images['clouds'][0], rng.randrange(width), rng.randint(50, 200))
+    for i in range(scene['flying_dinos']):
+        add(images['flying_dinos'][i % 2], rng.randrange(width), rng.randint(50, 200))
+    for i in range(scene['floor']):
+        add(images['floor'][0], (i * 64) % (width + 128), height - 94)
+    add(images['dino'][0], 50, height - 100)
+    for i in range(scene['obstacles']):
+        add(images['obstacles'][i % 2], rng.randrange(width), height - 100)
+    return all_sprites
+
+
+def prepare_scene(size, scene):
+    # Load everything up front so repeats only time drawing (baking needs a display mode)
+    pygame.display.set_mode(size)
+    return size, load_and_scale(SKY_PATH, size), build_sprites(scene, size, random.Random(0))
+
+
+def time_scene(prepared, frames, warmup):
+    # One repeat: median frame and phase times in milliseconds
+    size, sky, all_sprites = prepared
+    screen = pygame.display.set_mode(size)
+    font = pygame.font.Font(None, 36)
+    black = (0, 0, 0)
+
+    timings = {phase: [] for phase in PHASES}
+    frame_times = []
+    for frame in range(warmup + frames):
+        start = time.perf_counter()
+        screen.blit(sky, (0, 0))
+        after_sky = time.perf_counter()
+        all_sprites.draw(screen)
+        after_sprites = time.perf_counter()
+        score_text = font.render(f'Score: {frame}  Jumps: {frame // 60}', True, black)
+        screen.blit(score_text, (10, 10))
+        after_text = time.perf_counter()
+        pygame.display.flip()
+        end = time.perf_counter()
+
+        if frame < warmup:
+            continue
+        timings['sky'].append(after_sky - start)
+        timings['sprites'].append(after_sprites - after_sky)
+        timings['text'].append(after_text - after_sprites)
+        timings['flip'].append(end - after_text)
+        frame_times.append(end - start)
+
+    return {
+        'frame_ms': statistics.median(frame_times) * 1000,
+        'phases_ms': {phase: statistics.median(times) * 1000 for phase, times in timings.items()},
+    }
+
+
+def time_reference(frames):
+    # Fixed fill/blit work that doesn't depend on this repo, timed next to every scene
+    # repeat; scene times divided by it cancel out the machine speeding up or slowing down
+    target = pygame.Surface(DEFAULT_RESOLUTION)
+    tile = pygame.Surface((128, 128))
+    tile.fill((90, 160, 220))
+    times = []
+    for _ in range(frames):
+        start = time.perf_counter()
+        target.fill((255, 255, 255))
+        for x in range(0, DEFAULT_RESOLUTION[0], 128):
+            target.blit(tile, (x, 0))
+        times.append(time.perf_counter() - start)
+    return statistics.median(times) * 1000
+
+
+def relative_mad(values):
+    # Median absolute deviation as a fraction of the median: a noise estimate one odd repeat can't skew
+    median = statistics.median(values)
+    return statistics.median(abs(value - median) for value in values) / median
+
+
+def summarize(repeats):
+    # Median over repeats, keeping every repeat so a later comparison can see the noise
+    repeat_ms = [repeat['frame_ms'] for repeat in repeats]
+    repeat_relative = [repeat['relative'] for repeat in repeats]
+    frame_ms = statistics.median(repeat_ms)
+    relative = statistics.median(repeat_relative)
+    return {
+        'fps': 1000 / frame_ms,
+        'frame_ms': frame_ms,
+        'relative': relative,
+        'repeat_relative': repeat_relative,
+        'spread': (max(repeat_relative) - min(repeat_relative)) / relative,
+        'noise': relative_mad(repeat_relative),
+        'phases_ms': {phase: statistics.median(repeat['phases_ms'][phase] for repeat in repeats)
+                      for phase in PHASES},
+    }
+
+
+def is_regression(result, base, threshold):
+    # Slower only when the median (relative to the reference work) moved by more than
+    # the noise both runs measured, and by at least threshold
+    change = result['relative'] / base['relative'] - 1
+    noise = NOISE_MADS * math.hypot(result['noise'], base['noise'])
+    return change > max(threshold, noise)
+
+
+def print_results(results, baseline=None, threshold=0.1):
+    print(f"{'scene':<18}{'sprites':>8}{'fps':>10}{'spread':>9}" + ''.join(f'{p + " ms":>11}' for p in PHASES)
+          + ('   vs baseline' if baseline else ''))
+    regressions = []
+    for name, result in results.items():
+        line = f"{name:<18}{result['sprites']:>8}{result['fps']:>10.1f}{result['spread']:>9.1%}"
+        line += ''.join(f"{result['phases_ms'][p]:>11.3f}" for p in PHASES)
+        if baseline and name in baseline:
+            change = result['relative'] / baseline[name]['relative'] - 1
+            line += f'   {change:+.1%}'
+            if is_regression(result, baseline[name], threshold):
+                line += '  SLOWER'
+                regressions.append(name)
+        print(line)
+    return regressions
+
+
+def parse_resolution(text):
+    width, height = text.lower().split('x')
+    return int(width), int(height)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Headless rendering benchmark for the dino game draw path")
+    parser.add_argument('--frames', type=int, default=100, help="Timed frames per scene and repeat")
+    parser.add_argument('--warmup', type=int, default=10, help="Untimed frames before each repeat")
+    parser.add_argument('--repeats', type=int, default=5, help="Interleaved timing runs per scene")
+    parser.add_argument('--resolutions', type=lambda s: [parse_resolution(r) for r in s.split(',')],
+                        default=SWEEP_RESOLUTIONS, help="Comma separated WIDTHxHEIGHT list")
+    parser.add_argument('--save', help="Write results to this JSON file (e.g. a new baseline)")
+    parser.add_argument('--compare', help="Baseline JSON file to compare against")
+    parser.add_argument('--threshold', type=float, default=0.1,
+                        help="Smallest slowdown reported, even when the measured noise is lower")
+    args = parser.parse_args()
+
+    pygame.init()
+    scenes = build_scenes(args.resolutions, SWEEP_COUNTS)
+    prepared = {name: prepare_scene(size, scene) for name, size, scene in scenes}
+    repeats = {name: [] for name, _, _ in scenes}
+    # Interleave repeats so slow drift (other load, clock changes) hits every scene alike
+    for _ in range(args.repeats):
+        for name, _, _ in scenes:
+            reference_ms = time_reference(args.frames)
+            repeat = time_scene(prepared[name], args.frames, args.warmup)
+            repeat['relative'] = repeat['frame_ms'] / reference_ms
+            repeats[name].append(repeat)
+
+    results = {}
+    for name, size, scene in scenes:
+        result = summarize(repeats[name])
+        result.update({'resolution': list(size), 'scene': scene, 'sprites': sum(scene.values()) + 1})
+        results[name] = result
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)['results']
+    regressions = print_results(results, baseline, args.threshold)
+
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump({'pygame': pygame.version.ver, 'frames': args.frames, 'repeats': args.repeats,
+                       'results': results}, f, indent=2)
+    pygame.quit()
+    if regressions:
+        raise SystemExit(f"Slower than baseline: {', '.join(regressions)}")
@@ -0,0 +1,112 @@
+import json
+import random
+import statistics
+import time
+import zlib
+
+# Replay files are small JSON documents:
+#   seed         - value passed to random.seed() before any sprite is created
+#   frames       - number of game frames in the session
+#   jump_frames  - frames on which a jump input arrived
+#   reset_frames - frames on which R was pressed
+#   frame_ms     - milliseconds each frame advanced the animation clock
+#   jumps        - the same jumps in seconds since start, for the real-time replay input
+#   checksum     - running CRC of the game state after every frame
+REPLAY_VERSION = 2
+
+
+def new_seed():
+    return random.SystemRandom().randrange(2**32)
+
+
+def update_checksum(checksum, state):
+    return zlib.crc32(repr(state).encode(), checksum)
+
+
+class ReplayRecorder:
+    def __init__(self, path, seed):
+        self.path = path
+        self.seed = seed
+        self.frame = 0
+        self.jump_frames = []
+        self.reset_frames = []
+        self.frame_ms = []
+        self.jump_times = []
+        self.checksum = 0
+        self.elapsed_ms = 0  # Game-loop time, so startup isn't counted in the jump times
+
+    def record(self, jump, reset, frame_ms):
+        self.frame_ms.append(frame_ms)
+        self.elapsed_ms += frame_ms
+        if jump:
+            self.jump_frames.append(self.frame)
+            self.jump_times.append(round(self.elapsed_ms / 1000, 4))
+        if reset:
+            self.reset_frames.append(self.frame)
+
+    def end_frame(self, state):
+        self.checksum = update_checksum(self.checksum, state)
+        self.frame += 1
+
+    def save(self):
+        with open(self.path, 'w') as f:
+            json.dump({
+                'version': REPLAY_VERSION,
+                'seed': self.seed,
+                'frames': self.frame,
+                'jump_frames': self.jump_frames,
+                'reset_frames': self.reset_frames,
+                'frame_ms': self.frame_ms,
+                'jumps': self.jump_times,
+                'checksum': self.checksum,
+            }, f)
+
+
+class ReplayPlayer:
+    def __init__(self, path):
+        with open(path) as f:
+            data = json.load(f)
+        if data.get('version') != REPLAY_VERSION:
+            raise ValueError(f"Unsupported replay version in {path}")
+        self.seed = data['seed']
+        self.frames = data['frames']
+        self.jump_frames = set(data['jump_frames'])
+        self.reset_frames = set(data['reset_frames'])
+        self.frame_ms = data['frame_ms']
+        self.expected_checksum = data['checksum']
+        self.frame = 0
+        self.checksum = 0
+        self.frame_times = []
+        self.last_frame_start = None
+
+    def finished(self):
+        return self.frame >= self.frames
+
+    def inputs(self):
+        # (jump, reset, frame_ms) for the current frame
+        now = time.perf_counter()
+        if self.last_frame_start is not None:
+            self.frame_times.append(now - self.last_frame_start)
+        self.last_frame_start = now
+        return self.frame in self.jump_frames, self.frame in self.reset_frames, self.frame_ms[self.frame]
+
+    def end_frame(self, state):
+        self.checksum = update_checksum(self.checksum, state)
+        self.frame += 1
+
+    def matches(self):
+        return self.finished() and self.checksum == self.expected_checksum
+
+    def report(self):
+        frame_ms = sorted(seconds * 1000 for seconds in self.frame_times)
+        stats = {
+            'frames': self.frame,
+            'matches_recording': self.matches(),
+        }
+        if frame_ms:
+            stats.update({
+                'mean_frame_ms': statistics.fmean(frame_ms),
+                'p95_frame_ms': frame_ms[min(len(frame_ms) - 1, int(len(frame_ms) * 0.95))],
+                'fps': 1000 / statistics.fmean(frame_ms),
+            })
+        return stats
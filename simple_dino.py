@@ -1,7 +1,43 @@
+import argparse
 import pygame
 import random
 import os
-from jump_detection import JumpDetector
+from animation import AnimatedSprite, AnimationClock, AnimationSet, bake
+from collision import CollisionTable
+from input_backends import BACKENDS, create_backend, load_canny_classifier
+from replay import ReplayPlayer, ReplayRecorder, new_seed
+
+# Command line options
+parser = argparse.ArgumentParser(description="Dino Game")
+parser.add_argument('--input', choices=sorted(BACKENDS), default='pose', help="How jumps are detected")
+parser.add_argument('--model', default=os.path.join('Chrome_Dinosaur_Game', 'jump_model.pkl'),
+                    help="Jump classifier for the canny input")
+parser.add_argument('--replay', help="Jump file for the replay input")
+parser.add_argument('--record', help="Save this session to a replay file")
+parser.add_argument('--play', help="Re-run a recorded session exactly")
+parser.add_argument('--headless', action='store_true', help="With --play: no window, run at max speed")
+parser.add_argument('--seed', type=int, help="Random seed (defaults to a fresh one when recording)")
+args = parser.parse_args()
+if args.input == 'replay' and not args.replay:
+    parser.error("--input replay needs --replay FILE")
+if args.headless and not args.play:
+    parser.error("--headless only works with --play")
+if args.play and (args.record or args.seed is not None):
+    parser.error("--play takes its seed and inputs from the replay file; drop --record/--seed")
+
+# Deterministic sessions: seed before any sprite picks a random height or image
+replay_player = ReplayPlayer(args.play) if args.play else None
+replay_recorder = None
+if replay_player:
+    random.seed(replay_player.seed)
+    if args.headless:
+        os.environ['SDL_VIDEODRIVER'] = 'dummy'
+        os.environ['SDL_AUDIODRIVER'] = 'dummy'
+elif args.record or args.seed is not None:
+    seed = args.seed if args.seed is not None else new_seed()
+    random.seed(seed)
+    if args.record:
+        replay_recorder = ReplayRecorder(args.record, seed)
 
 # Initialize Pygame and its mixer
 pygame.init()
@@ -24,11 +60,6 @@ def load_and_scale(path, size):
 
 # Load and scale images once
 SKY_IMAGE = load_and_scale(os.path.join('art', 'sky.png'), (SCREEN_WIDTH, SCREEN_HEIGHT))
-DINO_IMAGES = [load_and_scale(os.path.join('art', f'dino_run({i}).png'), (90, 90)) for i in range(1, 8)]
-FLYING_DINO_IMAGES = [
-    load_and_scale(os.path.join('art', 'fly_dino0.png'), (80, 80)),
-    load_and_scale(os.path.join('art', 'fly_dino1.png'), (80, 80))
-]
 OBSTACLE_IMAGES = [
     load_and_scale(os.path.join('art', 'obstacles', f'obstacle{i}.png'), (60, 80))
     for i in range(2)  # Load obstacle0.png and obstacle1.png
@@ -36,6 +67,24 @@ OBSTACLE_IMAGES = [
 FLOOR_IMAGE = load_and_scale(os.path.join('art', 'floor.png'), (94, 94))
 CLOUD_IMAGE = load_and_scale(os.path.join('art', 'clouds.png'), (128, 71))
 
+# Animation constants
+ANIMATION_SPEED = 6  # Running and flying frames per second; lower number = slower animation
+
+# Pre-bake every animation state once: scaled, alpha-converted, masks attached
+def png_sequence(name, count):
+    return [os.path.join('art', 'png', f'{name} ({i}).png') for i in range(1, count + 1)]
+
+DINO_ANIMATIONS = (AnimationSet()
+    .add('run', bake([os.path.join('art', f'dino_run({i}).png') for i in range(1, 8)], (90, 90)), ANIMATION_SPEED)
+    .add('jump', bake(png_sequence('Jump', 12), (90, 90)), 20, loop=False)  # About one jump long
+    .add('dead', bake(png_sequence('Dead', 8), (90, 90)), 12, loop=False))
+FLYING_DINO_ANIMATIONS = AnimationSet().add(
+    'fly', bake([os.path.join('art', f'fly_dino{i}.png') for i in range(2)], (80, 80)), ANIMATION_SPEED)
+
+# Masks and every dino/obstacle collision offset, computed once at load time
+OBSTACLE_MASKS = [pygame.mask.from_surface(image) for image in OBSTACLE_IMAGES]
+COLLISION_TABLE = CollisionTable(DINO_ANIMATIONS.masks, OBSTACLE_MASKS)
+
 # Load sounds with lower quality for better performance
 pygame.mixer.init(frequency=22050, size=-16, channels=1)
 DEATH_SOUND = pygame.mixer.Sound(os.path.join('art', 'death_sound.wav'))
@@ -60,22 +109,14 @@ class GameState:
 game_state = GameState()
 clock = pygame.time.Clock()
 font = pygame.font.Font(None, 36)
+animation_clock = AnimationClock()  # Drives every animated sprite
 
-# Animation constants
-ANIMATION_SPEED = 6  # Lower number = slower animation
-ANIMATION_COOLDOWN = 60 // ANIMATION_SPEED  # Number of frames between animation updates
-
-class FlyingDino(pygame.sprite.Sprite):
+class FlyingDino(AnimatedSprite):
     def __init__(self, x):
-        super().__init__()
-        self.images = FLYING_DINO_IMAGES
-        self.index = 0
-        self.image = self.images[self.index]
+        super().__init__(FLYING_DINO_ANIMATIONS, animation_clock, 'fly')
         self.rect = self.image.get_rect()
         self.rect.x = x
         self.rect.y = random.randint(50, 200)  # Random height like clouds
-        self.animation_timer = 0
-        self.animation_cooldown = ANIMATION_COOLDOWN
 
     def update(self):
         # Move like clouds
@@ -85,11 +126,7 @@ class FlyingDino(pygame.sprite.Sprite):
             self.rect.y = random.randint(50, 200)
 
         # Animate wings
-        self.animation_timer += 1
-        if self.animation_timer >= self.animation_cooldown:
-            self.animation_timer = 0
-            self.index = (self.index + 1) % len(self.images)
-            self.image = self.images[self.index]
+        self.animate()
 
 class Cloud(pygame.sprite.Sprite):
     def __init__(self, x):
@@ -105,12 +142,9 @@ class Cloud(pygame.sprite.Sprite):
             self.rect.x = SCREEN_WIDTH
             self.rect.y = random.randint(50, 200)  # New random height when recycling
 
-class Dino(pygame.sprite.Sprite):
+class Dino(AnimatedSprite):
     def __init__(self):
-        super().__init__()
-        self.images = DINO_IMAGES
-        self.index = 0
-        self.image = self.images[self.index]
+        super().__init__(DINO_ANIMATIONS, animation_clock, 'run')
         self.rect = self.image.get_rect()
         self.rect.x = 50
         self.rect.y = SCREEN_HEIGHT - 100
@@ -118,16 +152,13 @@ class Dino(pygame.sprite.Sprite):
         self.gravity = 0.8
         self.velocity = 0
         self.is_jumping = False
-        self.mask = pygame.mask.from_surface(self.image)
-        # Animation variables
-        self.animation_timer = 0
-        self.animation_cooldown = ANIMATION_COOLDOWN
 
     def jump(self):
         if not self.is_jumping:
             JUMP_SOUND.play()  # Play jump sound when dinosaur jumps
             self.velocity = self.jump_speed
             self.is_jumping = True
+            self.play('jump')
 
     def update(self):
         if self.is_jumping:
@@ -138,16 +169,9 @@ class Dino(pygame.sprite.Sprite):
                 self.rect.y = SCREEN_HEIGHT - 100
                 self.is_jumping = False
                 self.velocity = 0
-        else:
-            # Update the animation timer
-            self.animation_timer += 1
-            if self.animation_timer >= self.animation_cooldown:
-                self.animation_timer = 0
-                # Update the dinosaur's image for running animation
-                self.index = (self.index + 1) % len(self.images)
-                self.image = self.images[self.index]
-                # Update mask for the new image
-                self.mask = pygame.mask.from_surface(self.image)
+                self.play('run')
+        # Pick the frame (and its mask) for the current state and time
+        self.animate()
 
 class Obstacle(pygame.sprite.Sprite):
     def __init__(self):
@@ -159,9 +183,10 @@ class Obstacle(pygame.sprite.Sprite):
         self.set_position(SCREEN_WIDTH, SCREEN_HEIGHT - 100)
 
     def set_random_image(self):
-        self.image = random.choice(self.images)
+        self.index = random.randrange(len(self.images))
+        self.image = self.images[self.index]
         self.rect = self.image.get_rect()
-        self.mask = pygame.mask.from_surface(self.image)
+        self.mask = OBSTACLE_MASKS[self.index]
 
     def set_position(self, x, y):
         self.rect.x = x
@@ -222,16 +247,17 @@ all_sprites.add(obstacle)
 obstacle_group.add(obstacle)
 
 def check_collision(dino, obstacle):
-    # Use mask collision for more precise hit detection with sprites
+    # Pixel-precise mask collision, looked up in the table built at load time
     offset_x = obstacle.rect.x - dino.rect.x
     offset_y = obstacle.rect.y - dino.rect.y
-    return dino.mask.overlap(obstacle.mask, (offset_x, offset_y)) is not None
+    return COLLISION_TABLE.collides(dino.index, obstacle.index, offset_x, offset_y)
 
 def reset_game():
     game_state.reset()
     dino.rect.y = SCREEN_HEIGHT - 100
     dino.velocity = 0
     dino.is_jumping = False
+    dino.play('run')
     obstacle.set_random_image()  # Choose new random obstacle
     obstacle.set_position(SCREEN_WIDTH, SCREEN_HEIGHT - 100)
     
@@ -249,8 +275,23 @@ def reset_game():
         flying_dino.rect.x = 150 + (i * 300)  # Offset from clouds
         flying_dino.rect.y = random.randint(50, 200)
 
-# Initialize jump detector
-jump_detector = JumpDetector()
+def game_snapshot():
+    # Everything that defines the game's behavior on this frame, for replay checksums
+    return (game_state.score, game_state.jumps, game_state.game_over, game_state.game_speed,
+            dino.index, obstacle.index,
+            tuple(tuple(sprite.rect) for sprite in all_sprites))
+
+# Initialize the input backend; camera work runs on its own thread
+if replay_player:
+    input_backend = None  # Inputs come from the replay file
+elif args.input == 'canny':
+    input_backend = create_backend('canny', load_canny_classifier(args.model))
+elif args.input == 'replay':
+    input_backend = create_backend('replay', args.replay)
+else:
+    input_backend = create_backend(args.input)
+if input_backend:
+    input_backend.start()
 
 # Performance settings
 MAX_FPS = 60
@@ -259,23 +300,43 @@ MIN_UPDATE_TIME = 1000 // MAX_FPS  # Minimum time between updates in millisecond
 # Game loop
 running = True
 last_update = pygame.time.get_ticks()
+max_speed = replay_player is not None and args.headless
 while running:
     # Control frame rate
     current_time = pygame.time.get_ticks()
-    if current_time - last_update < MIN_UPDATE_TIME:
+    if not max_speed and current_time - last_update < MIN_UPDATE_TIME:
         continue
+    frame_ms = current_time - last_update
     last_update = current_time
     # Handle events
+    restart_pressed = False
     for event in pygame.event.get():
         if event.type == pygame.QUIT:
             running = False
-            jump_detector.release()  # Clean up camera resources
-        if event.type == pygame.KEYDOWN:
-            if event.key == pygame.K_r and game_state.game_over:
-                reset_game()
+        if input_backend:
+            input_backend.handle_event(event)
+        if event.type == pygame.KEYDOWN and event.key == pygame.K_r:
+            restart_pressed = True
+
+    # Collect this frame's inputs, from the player or from a live backend
+    if replay_player:
+        if replay_player.finished():
+            break
+        jump_detected, restart_pressed, frame_ms = replay_player.inputs()
+    else:
+        input_backend.show_preview('Jump Detection')
+        jump_detected = input_backend.poll_jump()
+    if replay_recorder:
+        replay_recorder.record(jump_detected, restart_pressed, frame_ms)
+
+    # Animations pick their frames by elapsed time
+    animation_clock.tick(frame_ms)
+
+    if restart_pressed and game_state.game_over:
+        reset_game()
     
     # Check for jump detection
-    if jump_detector.is_jumping():
+    if jump_detected:
         if game_state.game_over:
             reset_game()  # Reset game if jump detected during game over
         elif not dino.is_jumping:
@@ -290,12 +351,15 @@ while running:
         if check_collision(dino, obstacle):
             DEATH_SOUND.play()  # Play death sound when collision occurs
             game_state.game_over = True
+            dino.play('dead')
         
         # Update score and speed
         if obstacle.update():
             game_state.score += 1
             if game_state.score % 5 == 0:
                 game_state.game_speed += 0.5
+    else:
+        dino.animate()  # Keep playing the death animation
 
     # Draw
     screen.blit(SKY_IMAGE, (0, 0))  # Draw sky background
@@ -312,8 +376,19 @@ while running:
 
     # Update display
     pygame.display.flip()
-    clock.tick(60)
+    if replay_recorder:
+        replay_recorder.end_frame(game_snapshot())
+    if replay_player:
+        replay_player.end_frame(game_snapshot())
+    if not max_speed:
+        clock.tick(60)
 
 # Clean up resources
-jump_detector.release()
+if replay_recorder:
+    replay_recorder.save()
+if replay_player:
+    print(replay_player.report())
+else:
+    input_backend.stop()
+    print(input_backend.latency_stats())
 pygame.quit()